@@ -1,22 +1,70 @@
 import os
 import argparse
+import dataclasses
+import importlib
+import itertools
+import shutil
+import subprocess
 import tempfile
+import types
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Optional, Tuple
-import whisper
+from typing import Callable, Iterator, List, Optional, Tuple
+import numpy as np
 
-try:
-    from moviepy import VideoFileClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    print("Warning: moviepy not installed. Install with: pip install moviepy")
-    MOVIEPY_AVAILABLE = False
+# Whisper works on 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Same fallback schedule and thresholds as whisper.transcribe
+FALLBACK_TEMPERATURES = (0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
 
 class AudioExtractor:
+    @staticmethod
+    def _check_ffmpeg():
+        """Raise if the ffmpeg binary is not available."""
+        if shutil.which("ffmpeg") is None:
+            raise FileNotFoundError("ffmpeg is required for audio/video processing. Please install it and add it to PATH.")
+
+    @staticmethod
+    def extract_audio_pcm(media_path: str) -> np.ndarray:
+        """
+        Decode the audio track of an audio or video file in memory.
+        
+        Args:
+            media_path: Path to the audio or video file
+            
+        Returns:
+            np.ndarray: 16 kHz mono float32 samples in [-1, 1], in a newly allocated buffer
+        """
+        AudioExtractor._check_ffmpeg()
+        proc = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error",
+                "-i", media_path,
+                "-vn", "-f", "s16le", "-acodec", "pcm_s16le",
+                "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-"
+            ],
+            capture_output=True
+        )
+        if proc.returncode != 0:
+            raise Exception(f"Error decoding audio: {proc.stderr.decode(errors='replace').strip()}")
+        # Convert and scale in a single pass into one float32 buffer. The result
+        # doesn't share memory with proc.stdout, so the raw bytes can be freed.
+        raw = np.frombuffer(proc.stdout, np.int16)
+        audio = np.empty(raw.shape, np.float32)
+        np.multiply(raw, np.float32(1 / 32768.0), out=audio, casting="unsafe")
+        return audio
+
     @staticmethod
     def extract_audio_from_video(video_path: str) -> Tuple[str, bool]:
         """
-        Extract audio from video file and save as temporary WAV file.
+        Extract audio from video file and save as temporary 16 kHz mono WAV file.
         
         Args:
             video_path: Path to the video file
@@ -24,21 +72,26 @@ class AudioExtractor:
         Returns:
             Tuple of (path_to_audio_file, is_temporary)
         """
-        if not MOVIEPY_AVAILABLE:
-            raise ImportError("moviepy is required for video processing. Install with: pip install moviepy")
+        AudioExtractor._check_ffmpeg()
             
         # Create a temporary file for the audio
         temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
         temp_audio.close()
         
         try:
-            # Extract audio from video
-            video = VideoFileClip(video_path)
-            audio = video.audio
-            # Remove verbose parameter as it's not supported in some versions
-            audio.write_audiofile(temp_audio.name, codec='pcm_s16le')
-            audio.close()
-            video.close()
+            # Decode straight to the format Whisper expects so it doesn't resample again
+            proc = subprocess.run(
+                [
+                    "ffmpeg", "-nostdin", "-y", "-loglevel", "error",
+                    "-i", video_path,
+                    "-vn", "-f", "wav", "-acodec", "pcm_s16le",
+                    "-ac", "1", "-ar", str(SAMPLE_RATE),
+                    temp_audio.name
+                ],
+                capture_output=True
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(proc.stderr.decode(errors="replace").strip())
             return temp_audio.name, True
         except Exception as e:
             # Clean up the temporary file if there was an error
@@ -47,50 +100,723 @@ class AudioExtractor:
             raise Exception(f"Error extracting audio from video: {str(e)}")
 
 
+class FFmpegPool:
+    """
+    Decode a queue of files with background ffmpeg processes, ahead of the consumer.
+    
+    Starting ffmpeg and decoding the next files overlaps with transcribing the
+    current one, so per-file process startup no longer stalls the model.
+    """
+    
+    def __init__(self, workers: int = 2, prefetch: int = 2):
+        """
+        Args:
+            workers: Number of ffmpeg processes allowed to run at once
+            prefetch: Number of files decoded ahead of the one being consumed
+        """
+        self.workers = workers
+        self.prefetch = prefetch
+        
+    def decode(self, media_paths: List[str]) -> Iterator[Tuple[str, Optional[np.ndarray], Optional[Exception]]]:
+        """
+        Decode files to 16 kHz mono float32 arrays.
+        
+        Yields:
+            Tuple of (media_path, audio, error) in input order. Exactly one of audio and error is None.
+        """
+        paths = iter(media_paths)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # ffmpeg runs as a subprocess, so threads decode in parallel without holding the GIL
+            pending = deque(
+                (path, executor.submit(AudioExtractor.extract_audio_pcm, path))
+                for path in itertools.islice(paths, self.prefetch + 1)
+            )
+            while pending:
+                media_path, future = pending.popleft()
+                try:
+                    result = media_path, future.result(), None
+                except Exception as e:
+                    result = media_path, None, e
+                # Only start the next file once this one is consumed, so at most
+                # prefetch decoded files wait alongside it
+                yield result
+                del result
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, executor.submit(AudioExtractor.extract_audio_pcm, next_path)))
+
+
+BACKENDS = ("whisper", "faster-whisper")
+COMPUTE_TYPES = ("int8", "int8_float16", "float16", "float32")
+
+
+def _enable_sdpa():
+    """
+    Route Whisper's attention through torch's scaled_dot_product_attention.
+    
+    This lets PyTorch dispatch to FlashAttention/memory-efficient kernels instead
+    of materializing the full QK^T matrix. Recent whisper releases support SDPA
+    natively; older ones get their qkv_attention patched.
+    """
+    import torch.nn.functional as F
+    from whisper.model import MultiHeadAttention
+    
+    if hasattr(MultiHeadAttention, "use_sdpa"):
+        MultiHeadAttention.use_sdpa = True
+        return
+    if not hasattr(F, "scaled_dot_product_attention") or getattr(MultiHeadAttention, "_sdpa_patched", False):
+        return
+        
+    def qkv_attention(self, q, k, v, mask=None):
+        n_ctx = q.shape[1]
+        q = q.view(*q.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        k = k.view(*k.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        v = v.view(*v.shape[:2], self.n_head, -1).permute(0, 2, 1, 3)
+        # Default scale 1/sqrt(d) equals Whisper's scale applied to both q and k
+        out = F.scaled_dot_product_attention(q, k, v, is_causal=mask is not None and n_ctx > 1)
+        # Attention weights are only needed for word timestamps, which aren't used here
+        return out.permute(0, 2, 1, 3).flatten(start_dim=2), None
+        
+    MultiHeadAttention.qkv_attention = qkv_attention
+    MultiHeadAttention._sdpa_patched = True
+
+
+class _DecoderGraph:
+    """
+    A single decoder step captured into a CUDA graph, with static KV-cache buffers.
+    
+    Whisper's own KV cache grows with torch.cat, so its tensor shapes change every
+    step and can't be captured. Here self-attention keys/values are written into
+    preallocated buffers of the full text context, and positions beyond the current
+    one are masked out, so every step has identical shapes and replays the graph.
+    """
+    
+    def __init__(self, model, n_batch: int, dtype):
+        import torch
+        
+        self.model = model
+        decoder = model.decoder
+        dims = model.dims
+        device = model.device
+        self.n_ctx = dims.n_text_ctx
+        
+        def buffers(n_ctx):
+            return [
+                torch.zeros(n_batch, n_ctx, dims.n_text_state, dtype=dtype, device=device)
+                for _ in decoder.blocks
+            ]
+            
+        self.token = torch.zeros(n_batch, 1, dtype=torch.long, device=device)
+        self.position = torch.zeros(1, dtype=torch.long, device=device)
+        self.positions = torch.arange(self.n_ctx, device=device)
+        self.self_k, self.self_v = buffers(self.n_ctx), buffers(self.n_ctx)
+        self.cross_k, self.cross_v = buffers(dims.n_audio_ctx), buffers(dims.n_audio_ctx)
+        self.dtype = dtype
+        
+        with torch.no_grad():
+            # Warm up on a side stream before capturing, as required by CUDA graphs
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    self._step()
+            torch.cuda.current_stream().wait_stream(stream)
+            
+            self.graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self.graph):
+                self.logits = self._step()
+                
+    @classmethod
+    def get(cls, model, n_batch: int, dtype) -> Optional["_DecoderGraph"]:
+        """
+        Get the model's captured graph, capturing it on first use.
+        
+        Each graph holds full-context KV buffers, so only one is kept per model, at
+        the first batch size seen (the main batch size under transcribe_batch).
+        Returns None for any other batch size or dtype, e.g. the tail batch or a
+        fallback retry subset, which are then decoded eagerly.
+        """
+        graph = model.__dict__.get("_decoder_graph")
+        if graph is None:
+            graph = model.__dict__["_decoder_graph"] = cls(model, n_batch, dtype)
+        if graph.token.shape[0] != n_batch or graph.dtype != dtype:
+            return None
+        return graph
+        
+    def _attend(self, q, k, v, mask=None):
+        import torch.nn.functional as F
+        
+        n_head = self.model.dims.n_text_head
+        q, k, v = (t.view(*t.shape[:2], n_head, -1).transpose(1, 2) for t in (q, k, v))
+        out = F.scaled_dot_product_attention(q, k, v, attn_mask=mask)
+        return out.transpose(1, 2).flatten(start_dim=2)
+        
+    def _step(self):
+        """Decode one token at self.position; this is what gets captured."""
+        import torch
+        
+        decoder = self.model.decoder
+        x = decoder.token_embedding(self.token) + decoder.positional_embedding.index_select(0, self.position)
+        x = x.to(self.dtype)
+        # Attend only to cache slots that have been filled so far
+        mask = (self.positions <= self.position).view(1, 1, 1, -1)
+        
+        for i, block in enumerate(decoder.blocks):
+            h = block.attn_ln(x)
+            self.self_k[i].index_copy_(1, self.position, block.attn.key(h))
+            self.self_v[i].index_copy_(1, self.position, block.attn.value(h))
+            x = x + block.attn.out(self._attend(block.attn.query(h), self.self_k[i], self.self_v[i], mask))
+            
+            h = block.cross_attn_ln(x)
+            x = x + block.cross_attn.out(self._attend(block.cross_attn.query(h), self.cross_k[i], self.cross_v[i]))
+            x = x + block.mlp(block.mlp_ln(x))
+            
+        x = decoder.ln(x)
+        return (x @ torch.transpose(decoder.token_embedding.weight.to(x.dtype), 0, 1)).float()
+        
+    def set_audio_features(self, audio_features):
+        """Precompute cross-attention keys/values for a new window (eager, once per decode)."""
+        for i, block in enumerate(self.model.decoder.blocks):
+            self.cross_k[i].copy_(block.cross_attn.key(audio_features))
+            self.cross_v[i].copy_(block.cross_attn.value(audio_features))
+            
+    def replay(self, token, position: int):
+        """Run the captured step for one token column and return its logits."""
+        self.token.copy_(token)
+        self.position.fill_(position)
+        self.graph.replay()
+        return self.logits.clone()
+        
+    def rearrange(self, source_indices):
+        """Reorder the cached batch rows, e.g. after beam search selects new beams."""
+        for buffer in self.self_k + self.self_v + self.cross_k + self.cross_v:
+            buffer.copy_(buffer[source_indices])
+
+
+def _enable_cuda_graphs(model):
+    """
+    Make Whisper's decoding use CUDA graph replay for this model's decoder steps.
+    
+    The inference class is defined here rather than at module level so that
+    importing this module doesn't import whisper (and with it torch).
+    """
+    import whisper.decoding
+    
+    PyTorchInference = whisper.decoding.PyTorchInference
+    if getattr(PyTorchInference, "uses_cuda_graphs", False):
+        model.use_cuda_graphs = True
+        return
+        
+    class _CUDAGraphInference(PyTorchInference):
+        """
+        Whisper inference that replays a captured CUDA graph for every decoder step.
+        
+        Used for models flagged with use_cuda_graphs on CUDA. Anything else, a batch
+        size without a graph, or a failed capture goes through the regular
+        PyTorchInference path. The static cache covers the full text context,
+        which Whisper's decoding never exceeds.
+        """
+        
+        uses_cuda_graphs = True
+        
+        def __init__(self, model, initial_token_length: int):
+            super().__init__(model, initial_token_length)
+            self.graph = None
+            self.eager = False
+            self.position = 0
+        
+        def logits(self, tokens, audio_features):
+            import torch
+        
+            if self.eager or not getattr(self.model, "use_cuda_graphs", False) or audio_features.device.type != "cuda":
+                return super().logits(tokens, audio_features)
+            
+            if self.graph is None:
+                try:
+                    self.graph = _DecoderGraph.get(self.model, tokens.shape[0], audio_features.dtype)
+                except RuntimeError as e:
+                    print(f"Warning: CUDA graph capture failed, decoding eagerly: {str(e)}")
+                    self.model.use_cuda_graphs = False
+                    return super().logits(tokens, audio_features)
+                if self.graph is None:
+                    # No graph for this batch size; decode this window eagerly
+                    self.eager = True
+                    return super().logits(tokens, audio_features)
+                self.graph.set_audio_features(audio_features)
+            
+            # The first call feeds the whole prompt, later calls only the newest token
+            logits = []
+            for column in range(self.position, tokens.shape[-1]):
+                logits.append(self.graph.replay(tokens[:, column:column + 1], column))
+            self.position = tokens.shape[-1]
+            return torch.cat(logits, dim=1)
+        
+        def rearrange_kv_cache(self, source_indices):
+            if self.graph is None:
+                return super().rearrange_kv_cache(source_indices)
+            if source_indices != list(range(len(source_indices))):
+                self.graph.rearrange(source_indices)
+            
+        def cleanup_caching(self):
+            super().cleanup_caching()
+            self.graph = None
+            self.eager = False
+            self.position = 0
+            
+    whisper.decoding.PyTorchInference = _CUDAGraphInference
+    model.use_cuda_graphs = True
+
+
+class _WindowProgress:
+    """Stand-in for whisper's tqdm progress bar that forwards progress to a callback."""
+    
+    def __init__(self, callback: Callable[[float], None], total: int, **kwargs):
+        self.callback = callback
+        self.total = total
+        self.n = 0
+        
+    def update(self, n: int):
+        # Whisper calls this once per decoded 30 s window
+        self.n += n
+        self.callback(min(self.n / self.total, 1.0) if self.total else 1.0)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        return False
+
+
+@contextmanager
+def _whisper_progress(callback: Callable[[float], None]):
+    """Route whisper.transcribe's per-window progress to callback instead of tqdm."""
+    # whisper/__init__ rebinds whisper.transcribe to the function, so
+    # "import whisper.transcribe as ..." would not give the module
+    whisper_transcribe = importlib.import_module("whisper.transcribe")
+    
+    original = whisper_transcribe.tqdm
+    whisper_transcribe.tqdm = types.SimpleNamespace(tqdm=lambda **kwargs: _WindowProgress(callback, **kwargs))
+    try:
+        yield
+    finally:
+        whisper_transcribe.tqdm = original
+
+
+@contextmanager
+def _reuse_audio_features(model):
+    """
+    Make model.decode encode each mel segment only once.
+    
+    whisper.transcribe's temperature fallback calls model.decode again with the
+    same mel segment for every temperature, re-running the encoder each time.
+    decode() skips the encoder when given audio features, so the features of the
+    last segment are kept and passed instead of the mel on those retries.
+    """
+    import torch
+    
+    decode = model.decode
+    last = [None, None]
+    
+    def decode_reusing_features(mel, options, **kwargs):
+        if last[0] is not mel:
+            with torch.no_grad():
+                batch = mel.unsqueeze(0) if mel.ndim == 2 else mel
+                features = model.embed_audio(batch.half() if options.fp16 else batch)
+            last[:] = mel, features[0] if mel.ndim == 2 else features
+        return decode(last[1], options, **kwargs)
+        
+    model.decode = decode_reusing_features
+    try:
+        yield
+    finally:
+        del model.decode
+
+
+def _is_silent(result) -> bool:
+    """Whether whisper would treat a decoded window as silence."""
+    return result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _needs_fallback(result) -> bool:
+    """Whether whisper would re-decode a window at a higher temperature."""
+    if _is_silent(result):
+        return False
+    return (
+        result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+        or result.avg_logprob < LOGPROB_THRESHOLD
+    )
+
+
 class ArabicAudioTranscriber:
-    def __init__(self, model_name: str = "base", models_dir: str = None):
+    # Loaded models shared by all instances, keyed by
+    # (backend, model_name, device, compute_type, use_compile, cuda_graphs, cpu_bf16).
+    # At most one model is kept per device.
+    _MODEL_CACHE: dict = {}
+    
+    def __init__(
+        self,
+        model_name: str = "base",
+        models_dir: str = None,
+        backend: str = "whisper",
+        threads: int = 0,
+        compute_type: Optional[str] = None,
+        use_compile: bool = False,
+        cuda_graphs: bool = False,
+        cpu_bf16: bool = False,
+        vad: bool = True,
+        temperature_fallback: bool = False,
+        progress_callback: Optional[Callable[[str, float], None]] = None
+    ):
         """
         Initialize the Arabic audio transcriber with a Whisper model.
         
         Args:
             model_name: The Whisper model to use (tiny, base, small, medium, large, large-v2, large-v3)
             models_dir: Directory containing the Whisper models. If None, uses default location.
+            backend: Inference backend, either 'whisper' (openai-whisper) or 'faster-whisper' (CTranslate2)
+            threads: Number of CPU threads for the faster-whisper backend (0 = library default)
+            compute_type: Weight/activation precision (int8, int8_float16, float16, float32).
+                If None, uses int8 on CPU and int8_float16 on GPU. With openai-whisper, int8 types
+                apply dynamic int8 quantization to the Linear layers on CPU.
+            use_compile: If True, compile the encoder/decoder with torch.compile (openai-whisper backend only)
+            cuda_graphs: If True, replay decoder steps from a captured CUDA graph (openai-whisper backend
+                on GPU only; not combined with use_compile, which already uses CUDA graphs)
+            cpu_bf16: If True, run CPU inference in bfloat16 instead of int8 (openai-whisper backend only,
+                best on CPUs with AMX/AVX512-BF16)
+            vad: If True, drop silence before transcription (Silero VAD for openai-whisper if
+                silero-vad is installed, the built-in VAD filter for faster-whisper)
+            temperature_fallback: If True, re-decode windows that look like failed decodes at
+                higher temperatures (openai-whisper backend). Off by default to keep output deterministic.
+            progress_callback: Optional function called with (media_path, fraction_done) after
+                each decoded 30 s window
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+        if compute_type is not None and compute_type not in COMPUTE_TYPES:
+            raise ValueError(f"Unknown compute type '{compute_type}'. Choose one of: {', '.join(COMPUTE_TYPES)}")
         self.model_name = model_name
         self.models_dir = "./models"
+        self.backend = backend
+        self.threads = threads
+        self.compute_type = compute_type
+        self.use_compile = use_compile
+        self.cuda_graphs = cuda_graphs
+        self.cpu_bf16 = cpu_bf16
+        self.vad = vad
+        self.temperature_fallback = temperature_fallback
+        self.progress_callback = progress_callback
+        self._vad_model = None
         self.model = None
         
     def _get_model_path(self):
-        """Get the full path to the model file."""
-        model_file = f"{self.model_name}.pt"
-        model_path = os.path.join(self.models_dir, model_file)
+        """
+        Get the full path to the model.
         
-        # Check if model exists in the specified directory
-        if not os.path.exists(model_path):
+        The openai-whisper backend expects a '<model_name>.pt' checkpoint, or one saved
+        under its download name (e.g. 'large-v3.pt' for 'large'), which is downloaded
+        (and hash-checked) into the models directory if missing. faster-whisper expects
+        a '<model_name>' directory converted with 'ct2-transformers-converter --quantization int8'.
+        """
+        if self.backend == "faster-whisper":
+            model_path = os.path.join(self.models_dir, self.model_name)
+            if not os.path.isdir(model_path):
+                raise FileNotFoundError(
+                    f"Model '{self.model_name}' not found in {self.models_dir}. "
+                    f"Please make sure the model '{self.model_name}' exists in the models directory."
+                )
+            return model_path
+            
+        model_file = f"{self.model_name}.pt"
+        candidates = [model_file]
+        if self._is_downloadable():
+            import whisper
+            # Aliases such as 'large' and 'turbo' are saved under the checkpoint's own name
+            candidates.insert(0, os.path.basename(whisper._MODELS[self.model_name]))
+        for candidate in candidates:
+            model_path = os.path.join(self.models_dir, candidate)
+            if os.path.exists(model_path):
+                return model_path
+                
+        if len(candidates) == 1:
             raise FileNotFoundError(
                 f"Model '{self.model_name}' not found in {self.models_dir}. "
-                f"Please make sure the model file '{model_file}' exists in the models directory."
+                f"Please make sure the model '{model_file}' exists in the models directory."
             )
+        
+        print(f"Model '{candidates[0]}' not found in {self.models_dir}, downloading...")
+        model_path = os.path.join(self.models_dir, candidates[0])
+        os.makedirs(self.models_dir, exist_ok=True)
+        # Download into a private directory and move the checked file into place, so
+        # worker processes fetching the same checkpoint never write to one file
+        download_dir = tempfile.mkdtemp(dir=self.models_dir)
+        try:
+            downloaded = whisper._download(whisper._MODELS[self.model_name], download_dir, False)
+            os.replace(downloaded, model_path)
+        finally:
+            shutil.rmtree(download_dir, ignore_errors=True)
         return model_path
 
-    def load_model(self):
-        """Load the Whisper model for speech recognition with CPU fallback."""
+    def estimate_memory(self) -> int:
+        """
+        Roughly estimate the memory (in bytes) one loaded copy of the model needs.
+        
+        openai-whisper checkpoints store float16 weights that are loaded as float32,
+        plus headroom for activations and the KV cache.
+        """
+        model_path = self._get_model_path()
+        if os.path.isdir(model_path):
+            size = sum(entry.stat().st_size for entry in os.scandir(model_path) if entry.is_file())
+            return int(size * 1.5)
+        return os.path.getsize(model_path) * 3
+
+    def _is_downloadable(self) -> bool:
+        """Whether openai-whisper publishes a checkpoint under this model name."""
+        import whisper
+        return self.model_name in whisper._MODELS
+
+    def set_model_name(self, model_name: str):
+        """Switch to another model; it is loaded (or fetched from the cache) on next use."""
+        if model_name != self.model_name:
+            self.model_name = model_name
+            self.model = None
+
+    def set_compute_type(self, compute_type: Optional[str]):
+        """Switch precision; the model is loaded (or fetched from the cache) on next use."""
+        if compute_type is not None and compute_type not in COMPUTE_TYPES:
+            raise ValueError(f"Unknown compute type '{compute_type}'. Choose one of: {', '.join(COMPUTE_TYPES)}")
+        if compute_type != self.compute_type:
+            self.compute_type = compute_type
+            self.model = None
+
+    def _resolve_compute_type(self, device: str) -> str:
+        """Get the compute type to use on a device, applying the per-device default."""
+        if self.compute_type is not None:
+            return self.compute_type
+        return "int8" if device == "cpu" else "int8_float16"
+
+    def _use_fp16(self) -> bool:
+        """Whether the loaded openai-whisper model decodes in float16 (GPU only)."""
+        return self.model.device.type == "cuda" and self._resolve_compute_type("cuda") != "float32"
+
+    def get_precision(self) -> str:
+        """
+        Get the precision the loaded model actually runs in.
+        
+        With openai-whisper this can differ from the compute type: on GPU every type
+        except float32 runs in float16, and on CPU int8 types run dynamically quantized,
+        bfloat16 is used if enabled, and anything else runs in float32.
+        """
+        if self.backend == "faster-whisper":
+            return self._resolve_compute_type(self.model.model.device)
+        if self.model.device.type == "cuda":
+            return "float16" if self._use_fp16() else "float32"
+        if self._uses_bf16():
+            return "bfloat16"
+        return "int8" if self._resolve_compute_type("cpu").startswith("int8") else "float32"
+
+    def _get_device(self) -> str:
+        """Get the device the current backend will run on."""
+        if self.backend == "faster-whisper":
+            import ctranslate2
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
         import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    def load_model(self):
+        """Load the Whisper model, reusing an already loaded one when possible."""
+        device = self._get_device()
+        key = (
+            self.backend, self.model_name, device, self._resolve_compute_type(device),
+            self.use_compile, self.cuda_graphs, self.cpu_bf16
+        )
+        if key in self._MODEL_CACHE:
+            self.model = self._MODEL_CACHE[key]
+            print(f"Using already loaded {self.model_name} model")
+            return
+            
+        self._evict_models(device)
+        if self.backend == "faster-whisper":
+            self._load_faster_whisper_model(device)
+        else:
+            self._load_whisper_model(device)
+        self._MODEL_CACHE[key] = self.model
+        
+        precision = self.get_precision()
+        if precision != self._resolve_compute_type(device):
+            print(f"Compute type '{self._resolve_compute_type(device)}' is not available here, running in {precision}")
+
+    def _evict_models(self, device: str):
+        """Drop cached models on a device so a different one can be loaded there."""
+        evicted = [key for key in self._MODEL_CACHE if key[2] == device]
+        if not evicted:
+            return
+        for key in evicted:
+            del self._MODEL_CACHE[key]
+        self.model = None
+        
+        if device == "cuda" and self.backend == "whisper":
+            import gc
+            import torch
+            # Release the freed weights back to the GPU before loading the next model
+            gc.collect()
+            torch.cuda.empty_cache()
+
+    def _load_whisper_model(self, device: str):
+        """Load the openai-whisper model for speech recognition with CPU fallback."""
+        _enable_sdpa()
         
         # Get the full path to the model file
         model_path = self._get_model_path()
-        device = "cuda" if torch.cuda.is_available() else "cpu"
         
         print(f"Loading Whisper {self.model_name} model from {model_path} on {device.upper()}...")
         
         try:
             # Try loading with GPU first
-            self.model = whisper.load_model(model_path, device=device)
+            self.model = self._load_checkpoint(model_path, device)
             print(f"Model loaded successfully on {device.upper()}")
         except RuntimeError as e:
             if "CUDA out of memory" in str(e) and device == "cuda":
                 print("CUDA out of memory, falling back to CPU...")
-                self.model = whisper.load_model(model_path, device="cpu")
+                self.model = self._load_checkpoint(model_path, "cpu")
+                print("Model loaded successfully on CPU")
+            else:
+                raise e
+        
+        if self._uses_bf16():
+            self._optimize_bf16()
+        elif self.model.device.type == "cpu" and self._resolve_compute_type("cpu").startswith("int8"):
+            self._quantize_dynamic()
+        if self.use_compile:
+            self._compile_model()
+        elif self.cuda_graphs and self.model.device.type == "cuda":
+            _enable_cuda_graphs(self.model)
+            print("Decoder steps will be replayed from CUDA graphs")
+
+    def _load_checkpoint(self, model_path: str, device: str):
+        """
+        Build a Whisper model from a checkpoint, memory-mapping the file where supported.
+        
+        Equivalent to whisper.load_model, but with mmap=True (PyTorch 2.1+) the
+        checkpoint's tensors are paged in from disk while being copied into the
+        model's parameters, instead of first being read into a full in-RAM copy
+        of the state dict.
+        """
+        import pickle
+        import torch
+        import whisper
+        from whisper.model import ModelDimensions, Whisper
+        
+        try:
+            checkpoint = torch.load(model_path, map_location="cpu", mmap=True, weights_only=True)
+        except (TypeError, RuntimeError, pickle.UnpicklingError):
+            # Older PyTorch has no mmap argument, legacy (non-zip) checkpoints can't be mapped,
+            # and checkpoints with non-allowlisted objects are rejected by weights_only
+            checkpoint = torch.load(model_path, map_location="cpu")
+            
+        model = Whisper(ModelDimensions(**checkpoint["dims"]))
+        model.load_state_dict(checkpoint["model_state_dict"])
+        del checkpoint
+        
+        alignment_heads = whisper._ALIGNMENT_HEADS.get(self.model_name)
+        if alignment_heads is not None:
+            model.set_alignment_heads(alignment_heads)
+        return model.to(device)
+
+    def _uses_bf16(self) -> bool:
+        """Whether the loaded openai-whisper model should run in bfloat16 on the CPU."""
+        return self.cpu_bf16 and self.model.device.type == "cpu"
+
+    def _quantize_dynamic(self):
+        """Quantize the Linear layers to int8 weights with dynamically quantized activations (CPU only)."""
+        import torch
+        
+        # Whisper uses its own nn.Linear subclass, which quantize_dynamic only matches
+        # by exact type; on CPU in float32 it behaves exactly like nn.Linear
+        for module in self.model.modules():
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+                
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+        print("Model quantized to int8")
+
+    def _optimize_bf16(self):
+        """
+        Run the encoder and decoder under bfloat16 autocast on the CPU.
+        
+        Outputs are cast back to float32 because Whisper's decoding checks that
+        audio features match the fp16 option. Intel Extension for PyTorch is
+        used to prepack the weights when it is installed.
+        """
+        import torch
+        
+        try:
+            import intel_extension_for_pytorch as ipex
+            self.model = ipex.optimize(self.model.eval(), dtype=torch.bfloat16)
+            print("Model optimized for bfloat16 with Intel Extension for PyTorch")
+        except ImportError:
+            print("Warning: intel_extension_for_pytorch not installed, using plain bfloat16 autocast")
+            
+        def autocast_forward(forward):
+            def wrapped(*args, **kwargs):
+                with torch.autocast(device_type="cpu", dtype=torch.bfloat16):
+                    return forward(*args, **kwargs).float()
+            return wrapped
+            
+        self.model.encoder.forward = autocast_forward(self.model.encoder.forward)
+        self.model.decoder.forward = autocast_forward(self.model.decoder.forward)
+
+    def _compile_model(self):
+        """
+        Compile the encoder and decoder with TorchInductor and warm them up.
+        
+        The warmup decodes 30 seconds of silence so the compile cost is paid
+        here rather than on the first real file.
+        """
+        import torch
+        import whisper
+        
+        if not hasattr(torch, "compile"):
+            print("Warning: torch.compile requires PyTorch 2.0+, running in eager mode")
+            return
+            
+        print("Compiling model with torch.compile (this may take a while)...")
+        self.model.encoder = torch.compile(self.model.encoder, mode="reduce-overhead", fullgraph=False)
+        self.model.decoder = torch.compile(self.model.decoder, mode="reduce-overhead", fullgraph=False)
+        
+        silence = torch.zeros(whisper.audio.N_SAMPLES, device=self.model.device)
+        mel = whisper.log_mel_spectrogram(silence, n_mels=self.model.dims.n_mels)
+        options = whisper.DecodingOptions(language="ar", fp16=self._use_fp16(), temperature=0.0)
+        with torch.no_grad():
+            self.model.decode(mel, options)
+        print("Model compiled successfully")
+
+    def _load_faster_whisper_model(self, device: str):
+        """Load a CTranslate2 model, with int8 weights by default (int8_float16 on GPU)."""
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper is required for this backend. Install with: pip install faster-whisper")
+        
+        model_path = self._get_model_path()
+        
+        def create(device):
+            return WhisperModel(
+                model_path,
+                device=device,
+                compute_type=self._resolve_compute_type(device),
+                cpu_threads=self.threads
+            )
+        
+        print(f"Loading faster-whisper {self.model_name} model from {model_path} on {device.upper()} "
+              f"({self._resolve_compute_type(device)})...")
+        
+        try:
+            self.model = create(device)
+            print(f"Model loaded successfully on {device.upper()}")
+        except RuntimeError as e:
+            if "out of memory" in str(e) and device == "cuda":
+                print("CUDA out of memory, falling back to CPU...")
+                self.model = create("cpu")
                 print("Model loaded successfully on CPU")
             else:
                 raise e
@@ -120,46 +846,323 @@ class ArabicAudioTranscriber:
         # Handle video files
         is_video = media_path.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'))
         audio_path = media_path
-        temp_audio = None
         
-        if is_video:
+        if is_video and keep_audio:
             print(f"Extracting audio from video: {media_path}")
-            audio_path, is_temp = AudioExtractor.extract_audio_from_video(media_path)
-            if is_temp and not keep_audio:
-                temp_audio = audio_path
+            audio_path, _ = AudioExtractor.extract_audio_from_video(media_path)
+            print(f"Extracted audio saved to: {audio_path}")
+            
+        # Decode once in memory instead of letting the model re-read a file
+        audio = AudioExtractor.extract_audio_pcm(audio_path)
+        if self.backend == "whisper":
+            audio = self._remove_silence(audio)
             
         if self.model is None:
             self.load_model()
         
         print(f"Transcribing {'video' if is_video else 'audio'}: {media_path}")
         
+        if self.backend == "faster-whisper":
+            text = self._transcribe_faster_whisper(media_path, audio, language)
+        else:
+            text = self._transcribe_whisper(media_path, audio, language)
+        
+        # Save the transcription if output path is provided
+        if output_path:
+            self.save_transcription(text, output_path)
+        
+        return text
+
+    @staticmethod
+    def save_transcription(text: str, output_path: str):
+        """Write a transcription to a UTF-8 text file."""
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Transcription saved to: {output_path}")
+
+    def transcribe_batch(
+        self,
+        media_paths: List[str],
+        language: str = "ar",
+        batch_size: int = 8
+    ) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        Transcribe several files through one warm model, batching 30 s windows.
+        
+        Args:
+            media_paths: Paths to the audio or video files
+            language: Language code (default: 'ar' for Arabic)
+            batch_size: Number of 30 s windows run through the model at once
+            
+        Yields:
+            Tuple of (media_path, text, error) in input order as each file completes.
+            Exactly one of text and error is None.
+        """
+        if self.model is None:
+            self.load_model()
+            
+        if self.backend == "faster-whisper":
+            yield from self._transcribe_batch_faster_whisper(media_paths, language, batch_size)
+        else:
+            yield from self._transcribe_batch_whisper(media_paths, language, batch_size)
+
+    def _transcribe_batch_faster_whisper(self, media_paths, language, batch_size):
+        """Transcribe files one by one, batching each file's windows with BatchedInferencePipeline."""
+        from faster_whisper import BatchedInferencePipeline
+        
+        pipeline = BatchedInferencePipeline(model=self.model)
+        for media_path, audio, error in FFmpegPool().decode(media_paths):
+            if error is not None:
+                yield media_path, None, error
+                continue
+            try:
+                segments, info = pipeline.transcribe(
+                    audio,
+                    language=language,
+                    beam_size=1,
+                    batch_size=batch_size,
+                    vad_filter=self.vad
+                )
+                yield media_path, self._join_segments(media_path, segments, info.duration), None
+            except Exception as e:
+                yield media_path, None, e
+
+    def _mel_windows(self, media_paths, errors: dict) -> Iterator[Tuple[int, Optional["torch.Tensor"], int, int]]:
+        """
+        Split every file into 30 s log-mel windows.
+        
+        Yields:
+            Tuple of (file_id, mel, window_index, window_count). mel is None if the file
+            failed to decode, in which case the error is stored in errors[file_id].
+        """
+        import torch
+        import whisper
+        
+        n_samples = whisper.audio.N_SAMPLES
+        for file_id, (_, audio, error) in enumerate(FFmpegPool().decode(media_paths)):
+            try:
+                if error is not None:
+                    raise error
+                audio = self._remove_silence(audio)
+                # Compute the spectrogram on the model's device
+                audio = torch.from_numpy(audio).to(self.model.device)
+            except Exception as e:
+                errors[file_id] = e
+                yield file_id, None, 0, 1
+                continue
+                
+            starts = range(0, max(len(audio), 1), n_samples)
+            for i, start in enumerate(starts):
+                window = whisper.pad_or_trim(audio[start:start + n_samples])
+                mel = whisper.log_mel_spectrogram(window, n_mels=self.model.dims.n_mels)
+                yield file_id, mel, i, len(starts)
+
+    def _window_decoding_options(self, language: str):
+        """Greedy decoding options for independently decoded 30 s windows."""
+        import whisper
+        
+        return whisper.DecodingOptions(
+            language=language,
+            fp16=self._use_fp16(),
+            temperature=0.0,
+            without_timestamps=True
+        )
+
+    def _decode_windows(self, mels: list, options) -> list:
+        """
+        Encode a batch of 30 s log-mel windows once and decode them.
+        
+        decode() skips the encoder when given audio features, so the temperature
+        fallback retries reuse the same encoder output instead of re-encoding.
+        """
+        import torch
+        
+        with torch.no_grad():
+            mels = torch.stack(mels)
+            if options.fp16:
+                mels = mels.half()
+            audio_features = self.model.embed_audio(mels)
+            results = self.model.decode(audio_features, options)
+            
+            for temperature in FALLBACK_TEMPERATURES if self.temperature_fallback else ():
+                retry = [i for i, result in enumerate(results) if _needs_fallback(result)]
+                if not retry:
+                    break
+                retry_options = dataclasses.replace(options, temperature=temperature)
+                for i, result in zip(retry, self.model.decode(audio_features[retry], retry_options)):
+                    results[i] = result
+        return results
+
+    def _transcribe_batch_whisper(self, media_paths, language, batch_size):
+        """Run 30 s windows from all files through the encoder/decoder in stacked batches."""
+        options = self._window_decoding_options(language)
+        # Partial outputs per file, in input order; finished files are flushed from the front
+        outputs = OrderedDict((file_id, []) for file_id in range(len(media_paths)))
+        finished = set()
+        errors = {}
+        
+        def run(batch):
+            try:
+                results = self._decode_windows([mel for _, mel, _, _ in batch], options)
+            except Exception as e:
+                # Fail only the files with windows in this batch; their remaining windows are skipped
+                for file_id, _, _, _ in batch:
+                    errors.setdefault(file_id, e)
+                    finished.add(file_id)
+                return
+            progress = {}
+            for (file_id, _, index, count), result in zip(batch, results):
+                outputs[file_id].append("" if _is_silent(result) else result.text)
+                progress[file_id] = (index + 1) / count
+                if index == count - 1:
+                    finished.add(file_id)
+            # One report per file per batch rather than per window
+            for file_id, fraction in progress.items():
+                self._report_progress(media_paths[file_id], fraction)
+        
+        def flush():
+            while outputs and next(iter(outputs)) in finished:
+                file_id, texts = outputs.popitem(last=False)
+                error = errors.pop(file_id, None)
+                if error is not None:
+                    yield media_paths[file_id], None, error
+                else:
+                    yield media_paths[file_id], " ".join(text.strip() for text in texts if text.strip()), None
+        
+        batch = []
+        for file_id, mel, index, count in self._mel_windows(media_paths, errors):
+            if file_id in errors or file_id in finished:
+                # The file failed to decode, or an earlier batch with its windows failed
+                finished.add(file_id)
+                continue
+            batch.append((file_id, mel, index, count))
+            if len(batch) == batch_size:
+                run(batch)
+                batch = []
+                yield from flush()
+        if batch:
+            run(batch)
+        yield from flush()
+
+    def _remove_silence(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Keep only the speech in the audio using Silero VAD.
+        
+        Fewer 30 s windows then reach the encoder. Returns the audio unchanged if
+        VAD is disabled or silero-vad is not installed.
+        """
+        if not self.vad:
+            return audio
+            
         try:
-            # Transcribe the audio with CPU-optimized settings
+            from silero_vad import get_speech_timestamps, load_silero_vad
+        except ImportError:
+            print("Warning: silero-vad not installed, transcribing silence too. Install with: pip install silero-vad")
+            self.vad = False
+            return audio
+            
+        import torch
+        
+        if self._vad_model is None:
+            self._vad_model = load_silero_vad()
+        timestamps = get_speech_timestamps(torch.from_numpy(audio), self._vad_model, sampling_rate=SAMPLE_RATE)
+        if not timestamps:
+            return audio[:0]
+        return np.concatenate([audio[ts["start"]:ts["end"]] for ts in timestamps])
+
+    def _report_progress(self, media_path: str, fraction: float):
+        """Forward transcription progress of a file to the progress callback, if any."""
+        if self.progress_callback is not None:
+            self.progress_callback(media_path, fraction)
+
+    def _join_segments(self, media_path: str, segments, duration: float) -> str:
+        """Collect faster-whisper segments into text, reporting progress as they are decoded."""
+        texts = []
+        # Segments are generated lazily; iterating them runs the decoder
+        for segment in segments:
+            texts.append(segment.text)
+            if duration:
+                self._report_progress(media_path, min(segment.end / duration, 1.0))
+        return "".join(texts).strip()
+
+    def _transcribe_whisper(self, media_path: str, audio: np.ndarray, language: str) -> str:
+        """Transcribe with the openai-whisper backend."""
+        import torch
+        
+        # Moving the samples to the model's device makes Whisper compute the
+        # log-mel spectrogram there (cuFFT on GPU) instead of on the CPU
+        device = self.model.device
+        audio = torch.from_numpy(audio).to(device)
+        
+        # Report progress once per 30 s window instead of printing every segment
+        if self.progress_callback is not None:
+            progress = _whisper_progress(lambda fraction: self._report_progress(media_path, fraction))
+        else:
+            progress = nullcontext()
+        
+        # Fallback retries reuse the segment's encoder output instead of re-encoding it
+        reuse_features = _reuse_audio_features(self.model) if self.temperature_fallback else nullcontext()
+        
+        # Transcribe the audio with CPU-optimized settings
+        with progress, reuse_features:
             result = self.model.transcribe(
-                audio_path,
+                audio,
                 language=language,
-                fp16=False,  # Disable mixed precision for CPU
-                verbose=True,  # Show progress
+                fp16=self._use_fp16(),  # Mixed precision only on GPU; CPU bf16 runs inside the model
+                verbose=False,  # Progress bar only, no per-segment printing
                 # Remove batch_size as it's not supported in some Whisper versions
                 condition_on_previous_text=False,  # Reduce memory usage
-                temperature=0.0,  # More deterministic output
+                # Greedy only for deterministic output, unless fallback is enabled
+                temperature=(0.0,) + FALLBACK_TEMPERATURES if self.temperature_fallback else 0.0,
                 best_of=1,  # Reduce memory usage
                 beam_size=1  # Reduce memory usage
             )
-            text = result["text"].strip()
-        finally:
-            # Clean up temporary audio file if it was created from a video
-            if temp_audio and os.path.exists(temp_audio):
-                os.unlink(temp_audio)
-        
-        # Save the transcription if output path is provided
-        if output_path:
-            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            print(f"Transcription saved to: {output_path}")
+        return result["text"].strip()
+
+    def _transcribe_faster_whisper(self, media_path: str, audio: np.ndarray, language: str) -> str:
+        """Transcribe with the faster-whisper (CTranslate2) backend."""
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            beam_size=1,
+            condition_on_previous_text=False,
+            vad_filter=self.vad  # Skip silent regions
+        )
+        return self._join_segments(media_path, segments, info.duration)
+
+def configure_cpu_threads(threads: int = 0) -> int:
+    """
+    Configure OpenMP, MKL and PyTorch (if installed) to use the same number of CPU threads.
+    
+    Args:
+        threads: Number of threads (0 = one per physical core, estimated as half the logical CPUs)
         
-        return text
+    Returns:
+        int: The number of threads configured
+    """
+    threads = threads or max(1, (os.cpu_count() or 2) // 2)
+    # OpenMP reads these when torch's libraries load, so this must run before the
+    # first torch import; this module imports torch/whisper lazily for that reason
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(threads))
+    os.environ.setdefault("OMP_PROC_BIND", "close")
+    os.environ.setdefault("OMP_PLACES", "cores")
+    
+    try:
+        import torch
+    except ImportError:
+        # faster-whisper runs on CTranslate2 alone, which only needs the env vars
+        return threads
+    torch.set_num_threads(threads)
+    try:
+        # GEMMs parallelize intra-op; extra inter-op threads only oversubscribe the cores
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set once, before any inter-op parallel work has started
+        pass
+    return threads
+
 
 def main():
     parser = argparse.ArgumentParser(description='Transcribe Arabic audio/video to text using Whisper')
@@ -170,18 +1173,39 @@ def main():
     parser.add_argument('--keep-audio', action='store_true',
                       help='Keep the extracted audio file (for video inputs)')
     parser.add_argument('--threads', type=int, default=0,
-                      help='Number of CPU threads to use (0 = use all available)')
+                      help='Number of CPU threads to use (0 = one per physical core)')
+    parser.add_argument('--backend', '-b', type=str, default='whisper', choices=BACKENDS,
+                      help='Inference backend (whisper, faster-whisper)')
+    parser.add_argument('--compute-type', type=str, default=None, choices=COMPUTE_TYPES,
+                      help='Precision to run the model in (default: int8 on CPU, int8_float16 on GPU)')
+    parser.add_argument('--compile', action='store_true',
+                      help='Compile the model with torch.compile (whisper backend, PyTorch 2.0+)')
+    parser.add_argument('--cuda-graphs', action='store_true',
+                      help='Replay decoder steps from a captured CUDA graph (whisper backend, GPU only)')
+    parser.add_argument('--bf16', action='store_true',
+                      help='Run CPU inference in bfloat16 (whisper backend, uses intel_extension_for_pytorch if installed)')
+    parser.add_argument('--temperature-fallback', action='store_true',
+                      help='Retry failed decodes at higher temperatures (non-deterministic output)')
+    parser.add_argument('--no-vad', action='store_true',
+                      help='Transcribe the whole audio instead of skipping silence with voice activity detection')
     
     args = parser.parse_args()
     
     try:
-        # Set number of CPU threads if specified
-        if args.threads > 0:
-            import torch
-            torch.set_num_threads(args.threads)
-            print(f"Using {args.threads} CPU threads")
+        threads = configure_cpu_threads(args.threads)
+        print(f"Using {threads} CPU threads")
             
-        transcriber = ArabicAudioTranscriber(model_name=args.model)
+        transcriber = ArabicAudioTranscriber(
+            model_name=args.model,
+            backend=args.backend,
+            threads=threads,
+            compute_type=args.compute_type,
+            use_compile=args.compile,
+            cuda_graphs=args.cuda_graphs,
+            cpu_bf16=args.bf16,
+            vad=not args.no_vad,
+            temperature_fallback=args.temperature_fallback
+        )
         transcription = transcriber.transcribe_media(
             media_path=args.media_path,
             output_path=args.output,
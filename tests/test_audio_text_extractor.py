@@ -0,0 +1,142 @@
+import sys
+import types
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+import audio_text_extractor
+from audio_text_extractor import ArabicAudioTranscriber, AudioExtractor, FFmpegPool, _whisper_progress
+
+
+def _stub_whisper():
+    """Build a stand-in whisper package laid out like openai-whisper's."""
+    package = types.ModuleType("whisper")
+    package.__path__ = []
+    module = types.ModuleType("whisper.transcribe")
+
+    def transcribe(total):
+        with module.tqdm.tqdm(total=total, unit="frames") as pbar:
+            for _ in range(total):
+                pbar.update(1)
+
+    module.tqdm = types.SimpleNamespace(tqdm=None)
+    module.transcribe = transcribe
+    # Like openai-whisper's "from .transcribe import transcribe" in __init__
+    package.transcribe = transcribe
+    return {"whisper": package, "whisper.transcribe": module}
+
+
+class WhisperProgressTest(unittest.TestCase):
+    def test_forwards_window_progress_to_callback(self):
+        modules = _stub_whisper()
+        original = modules["whisper.transcribe"].tqdm
+        fractions = []
+        with mock.patch.dict(sys.modules, modules):
+            with _whisper_progress(fractions.append):
+                modules["whisper.transcribe"].transcribe(4)
+
+        self.assertEqual(fractions, [0.25, 0.5, 0.75, 1.0])
+        self.assertIs(modules["whisper.transcribe"].tqdm, original)
+
+
+class _SyncExecutor:
+    """ThreadPoolExecutor stand-in that runs each job on submit and records its path."""
+
+    def __init__(self, submitted):
+        self.submitted = submitted
+
+    def __call__(self, max_workers):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, path):
+        self.submitted.append(path)
+        future = Future()
+        try:
+            future.set_result(fn(path))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class FFmpegPoolTest(unittest.TestCase):
+    def decode(self, paths, extract, prefetch=2):
+        submitted = []
+        with mock.patch.object(audio_text_extractor, "ThreadPoolExecutor", _SyncExecutor(submitted)), \
+                mock.patch.object(AudioExtractor, "extract_audio_pcm", side_effect=extract):
+            for result in FFmpegPool(prefetch=prefetch).decode(paths):
+                yield result, list(submitted)
+
+    def test_yields_results_in_input_order(self):
+        paths = ["a", "b", "c", "d"]
+        results = [result for result, _ in self.decode(paths, lambda path: path.upper())]
+        self.assertEqual(results, [(path, path.upper(), None) for path in paths])
+
+    def test_passes_through_per_file_errors(self):
+        error = RuntimeError("bad file")
+
+        def extract(path):
+            if path == "b":
+                raise error
+            return path.upper()
+
+        results = [result for result, _ in self.decode(["a", "b", "c"], extract)]
+        self.assertEqual(results, [("a", "A", None), ("b", None, error), ("c", "C", None)])
+
+    def test_submits_at_most_prefetch_files_ahead(self):
+        paths = [str(i) for i in range(6)]
+        for i, (_, submitted) in enumerate(self.decode(paths, lambda path: path, prefetch=2)):
+            self.assertEqual(submitted, paths[:min(i + 3, len(paths))])
+
+
+def _result(text):
+    return types.SimpleNamespace(text=text, no_speech_prob=0.0, avg_logprob=0.0, compression_ratio=1.0)
+
+
+class TranscribeBatchWhisperTest(unittest.TestCase):
+    def transcribe(self, windows, decode):
+        """Run the batch loop over fake (file_id, mel, index, count) windows; None mels fail to decode."""
+        transcriber = ArabicAudioTranscriber(vad=False)
+
+        def mel_windows(media_paths, errors):
+            for file_id, mel, index, count in windows:
+                if mel is None:
+                    errors[file_id] = RuntimeError(f"cannot decode {media_paths[file_id]}")
+                yield file_id, mel, index, count
+
+        with mock.patch.object(transcriber, "_mel_windows", side_effect=mel_windows), \
+                mock.patch.object(transcriber, "_window_decoding_options"), \
+                mock.patch.object(transcriber, "_decode_windows", side_effect=decode):
+            return list(transcriber._transcribe_batch_whisper(["a", "b", "c"], "ar", batch_size=2))
+
+    def test_flushes_failed_file_between_successful_ones_in_order(self):
+        windows = [(0, "a0", 0, 2), (0, "a1", 1, 2), (1, None, 0, 1), (2, "c0", 0, 1)]
+        results = self.transcribe(windows, lambda mels, options: [_result(mel) for mel in mels])
+
+        self.assertEqual([path for path, _, _ in results], ["a", "b", "c"])
+        self.assertEqual(results[0][1:], ("a0 a1", None))
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[1][2], RuntimeError)
+        self.assertEqual(results[2][1:], ("c0", None))
+
+    def test_failed_batch_fails_only_its_files(self):
+        error = RuntimeError("CUDA out of memory")
+
+        def decode(mels, options):
+            if "b0" in mels:
+                raise error
+            return [_result(mel) for mel in mels]
+
+        windows = [(0, "a0", 0, 1), (1, "b0", 0, 2), (1, "b1", 1, 2), (2, "c0", 0, 2), (2, "c1", 1, 2)]
+        results = self.transcribe(windows, decode)
+
+        self.assertEqual(results, [("a", None, error), ("b", None, error), ("c", "c0 c1", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,31 @@ import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 from tkinter import font as tkfont
 import os
+import multiprocessing
 import queue
 import threading
 import time
-from audio_text_extractor import ArabicAudioTranscriber
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from audio_text_extractor import ArabicAudioTranscriber, COMPUTE_TYPES, configure_cpu_threads
+
+
+# One transcriber per worker process, so the model path and VAD model are reused across files
+_worker_transcriber = None
+
+
+def _transcribe_one(file_path, model_name, compute_type):
+    """Transcribe one file in a worker process, reusing the process's transcriber and model."""
+    global _worker_transcriber
+    if _worker_transcriber is None:
+        _worker_transcriber = ArabicAudioTranscriber(model_name=model_name, compute_type=compute_type)
+    transcriber = _worker_transcriber
+    transcriber.set_model_name(model_name)
+    transcriber.set_compute_type(compute_type)
+    # Generate output path (same name with .txt extension)
+    output_path = os.path.splitext(file_path)[0] + ".txt"
+    transcriber.transcribe_media(media_path=file_path, output_path=output_path)
+    return transcriber.get_precision()
+
 
 class TranscriberApp:
     def __init__(self, root):
@@ -13,6 +34,12 @@ class TranscriberApp:
         self.root.title("Arabic Audio/Video Transcriber")
         self.root.geometry("800x600")
         self.setup_ui()
+        # Kept for the whole session so loaded models are reused across runs
+        self.transcriber = ArabicAudioTranscriber(
+            model_name=self.model_var.get(),
+            compute_type=self.ct_var.get(),
+            progress_callback=self.on_file_progress
+        )
         self.files_to_process = []
         self.stop_flag = False
         self.processing = False
@@ -53,6 +80,19 @@ class TranscriberApp:
         self.model_menu = ttk.Combobox(model_frame, textvariable=self.model_var, values=models, state="readonly")
         self.model_menu.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
         
+        ttk.Label(model_frame, text="Compute type:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
+        self.ct_var = tk.StringVar(value="int8")
+        self.ct_menu = ttk.Combobox(model_frame, textvariable=self.ct_var, values=COMPUTE_TYPES, state="readonly")
+        self.ct_menu.grid(row=0, column=3, sticky=tk.W, padx=5, pady=5)
+        
+        ttk.Label(model_frame, text="Workers:").grid(row=0, column=4, sticky=tk.W, padx=5, pady=5)
+        self.workers_var = tk.IntVar(value=1)
+        # More workers than physical cores only oversubscribes the CPU
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+        self.workers_spin = ttk.Spinbox(model_frame, textvariable=self.workers_var, from_=1, to=max_workers,
+                                        width=5, state="readonly")
+        self.workers_spin.grid(row=0, column=5, sticky=tk.W, padx=5, pady=5)
+        
         # Progress
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding=5)
         progress_frame.pack(fill=tk.X, pady=(0, 10))
@@ -78,19 +118,41 @@ class TranscriberApp:
         self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, height=10)
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
+    def on_file_progress(self, file_path, fraction):
+        # Called from the worker thread once per decoded window (or batch of windows)
+        self.log(f"{os.path.basename(file_path)}: {fraction:.0%} transcribed")
+        
     def log(self, message):
         self.log_queue.put(f"{time.strftime('%H:%M:%S')} - {message}")
         
     def update_log(self):
+        # Drain everything queued since the last tick and insert it in one go.
+        # The worker thread never touches Tk; progress and completion arrive here
+        # as ("progress", percent) and ("finished", None) tuples.
+        messages = []
+        progress = None
+        finished = False
         try:
             while True:
                 message = self.log_queue.get_nowait()
-                self.log_text.insert(tk.END, message + "\n")
-                self.log_text.see(tk.END)
-                self.root.update_idletasks()
+                if isinstance(message, tuple):
+                    kind, value = message
+                    if kind == "progress":
+                        progress = value
+                    elif kind == "finished":
+                        finished = True
+                else:
+                    messages.append(message + "\n")
         except queue.Empty:
             pass
+        if messages:
+            self.log_text.insert(tk.END, "".join(messages))
+            self.log_text.see(tk.END)
+        if progress is not None:
+            self.progress_var.set(progress)
         self.root.after(100, self.update_log)
+        if finished:
+            self.processing_finished()
         
     def add_files(self):
         files = filedialog.askopenfilenames(
@@ -137,9 +199,18 @@ class TranscriberApp:
         self.stop_flag = False
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
+        # Settings are read once per run; lock them until the worker finishes
+        self.set_settings_state(tk.DISABLED)
+        
+        # Read the settings here; the worker thread must not touch Tk variables
+        files = list(self.files_to_process)
+        workers = min(self.workers_var.get(), len(files))
         
         # Start processing in a separate thread
-        self.worker_thread = threading.Thread(target=self.process_files)
+        self.worker_thread = threading.Thread(
+            target=self.process_files,
+            args=(files, workers, self.model_var.get(), self.ct_var.get())
+        )
         self.worker_thread.daemon = True
         self.worker_thread.start()
         
@@ -152,45 +223,118 @@ class TranscriberApp:
                 self.transcriber.stop_transcription()
             self.log("Stopped transcription process")
             
-    def process_files(self):
-        model_name = self.model_var.get()
-        total_files = len(self.files_to_process)
-        self.transcriber = ArabicAudioTranscriber(model_name=model_name)
+    def process_files(self, files, workers, model_name, compute_type):
+        self.log(f"Transcribing {len(files)} file(s)...")
+        self.log_queue.put(("progress", 0))
         
-        for i, file_path in enumerate(self.files_to_process, 1):
+        try:
+            if workers > 1:
+                workers = self.limit_gpu_workers(workers, model_name)
+            if workers > 1:
+                self.process_files_parallel(files, workers, model_name, compute_type)
+            else:
+                self.process_files_batched(files, model_name, compute_type)
+        except Exception as e:
+            self.log(f"Error during transcription: {str(e)}")
+        
+        # Clean up
+        self.processing = False
+        self.log_queue.put(("finished", None))
+        
+    def process_files_batched(self, files, model_name, compute_type):
+        # Only this thread uses the transcriber during a run, so switching here is safe;
+        # the model is loaded (or fetched from the cache) by transcribe_batch
+        self.transcriber.set_model_name(model_name)
+        self.transcriber.set_compute_type(compute_type)
+        if self.transcriber.model is None:
+            self.transcriber.load_model()
+        self.log_precision(compute_type, self.transcriber.get_precision())
+        
+        # Windows from all files share one warm model and are batched together
+        results = self.transcriber.transcribe_batch(files)
+        for i, (file_path, text, error) in enumerate(results, 1):
+            if error is None:
+                try:
+                    # Generate output path (same name with .txt extension)
+                    output_path = os.path.splitext(file_path)[0] + ".txt"
+                    self.transcriber.save_transcription(text, output_path)
+                except Exception as e:
+                    error = e
+            self.file_finished(i, len(files), file_path, error)
+            
             if self.stop_flag or not self.processing:
                 break
                 
-            self.log(f"Processing file {i} of {total_files}: {os.path.basename(file_path)}")
-            self.progress_var.set((i-1) / total_files * 100)
-            self.root.update_idletasks()
-            
-            try:
-                # Generate output path (same name with .txt extension)
-                output_path = os.path.splitext(file_path)[0] + ".txt"
-                
-                # Transcribe
-                self.transcriber.transcribe_media(
-                    media_path=file_path,
-                    output_path=output_path
-                )
-                
-                self.log(f"Successfully transcribed: {os.path.basename(file_path)}")
-                
-            except Exception as e:
-                self.log(f"Error processing {os.path.basename(file_path)}: {str(e)}")
+    def limit_gpu_workers(self, workers, model_name):
+        # Every worker loads its own copy of the model, so on a GPU only run as
+        # many workers as there is free memory for
+        import torch
+        
+        if not torch.cuda.is_available():
+            return workers
+        free_memory, _ = torch.cuda.mem_get_info()
+        needed = ArabicAudioTranscriber(model_name=model_name).estimate_memory()
+        limit = max(1, free_memory // needed)
+        if workers > limit:
+            self.log(f"Only enough free GPU memory for {limit} worker(s), using {limit}")
+            return limit
+        return workers
+        
+    def process_files_parallel(self, files, workers, model_name, compute_type):
+        # Split the physical cores between workers instead of each using all of them
+        physical_cores = max(1, (os.cpu_count() or 2) // 2)
+        threads = max(1, physical_cores // workers)
+        self.log(f"Using {workers} worker processes with {threads} CPU thread(s) each")
+        # Spawn so workers never inherit an initialized CUDA context from this process
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=configure_cpu_threads,
+            initargs=(threads,)
+        ) as executor:
+            futures = {
+                executor.submit(_transcribe_one, file_path, model_name, compute_type): file_path
+                for file_path in files
+            }
+            precision_logged = False
+            for i, future in enumerate(as_completed(futures), 1):
+                error = future.exception()
+                if error is None and not precision_logged:
+                    # All workers load the model with the same settings
+                    self.log_precision(compute_type, future.result())
+                    precision_logged = True
+                self.file_finished(i, len(files), futures[future], error)
                 
-            # Update progress
-            self.progress_var.set(i / total_files * 100)
-            self.root.update_idletasks()
+                if self.stop_flag or not self.processing:
+                    # Drop queued files; files already running are allowed to finish
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                    
+    def log_precision(self, compute_type, precision):
+        # Not every compute type is supported on every device; say what actually runs
+        if precision != compute_type:
+            self.log(f"Compute type {compute_type} is not available on this device, running in {precision}")
         
-        # Clean up
-        self.processing = False
-        self.root.after(0, self.processing_finished)
+    def file_finished(self, done, total_files, file_path, error):
+        if error is not None:
+            self.log(f"Error processing {os.path.basename(file_path)}: {str(error)}")
+        else:
+            self.log(f"Successfully transcribed: {os.path.basename(file_path)}")
+            
+        # Update progress
+        self.log_queue.put(("progress", done / total_files * 100))
+        
+    def set_settings_state(self, state):
+        self.model_menu.config(state="readonly" if state == tk.NORMAL else tk.DISABLED)
+        self.ct_menu.config(state="readonly" if state == tk.NORMAL else tk.DISABLED)
+        self.workers_spin.config(state="readonly" if state == tk.NORMAL else tk.DISABLED)
         
     def processing_finished(self):
         self.start_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
+        self.set_settings_state(tk.NORMAL)
         self.progress_var.set(0)
         self.log("Processing completed!")
         